@@ -22,6 +22,23 @@ import scpy
 mnfact_linux = 'Prolific Technology Inc'
 
 
+def _on_off(on):
+    """Map an ON/OFF argument to 'ON' or 'OFF'.
+
+    Accepts 'ON'/'OFF' in any case, '1'/'0' and numbers (non-zero is ON).
+    Raises ValueError for anything else, so a typo never disables a protection.
+    """
+    if isinstance(on, str):
+        word = on.strip().upper()
+        if word in ('ON', '1'):
+            return 'ON'
+        if word in ('OFF', '0'):
+            return 'OFF'
+    elif isinstance(on, (int, float)):
+        return 'ON' if on else 'OFF'
+    raise ValueError(f"Expected 'ON'/'OFF' or 1/0, got {on!r}")
+
+
 class Ax6003Py(scpy.Scpy):
     """Python driver for a single-channel power supply unit:
        Manufacturer: AXIO MET
@@ -38,6 +55,13 @@ class Ax6003Py(scpy.Scpy):
        Inherits methods such as reset(), in_number(), status(), etc.
     """
 
+    # Fixed queries, encoded once
+    _CMD_APPL_Q = b'APPL?\n'
+    _CMD_MEAS_V = b':MEAS:VOLT?\n'
+    _CMD_MEAS_C = b':MEAS:CURR?\n'
+    _CMD_MEAS_P = b':MEAS:POWer?\n'
+    _CMD_MEAS_ALL = b':MEAS:VOLT?;:MEAS:CURR?;:MEAS:POWer?\n'
+
     def __init__(self, **kargs):
         """Initializes the serial connection with given arguments.
 
@@ -54,13 +78,31 @@ class Ax6003Py(scpy.Scpy):
         """
         super().__init__(**kargs)
         self.string_rep = f"Connected on {kargs} \n\n"
-        self.timeout = 1
-        _ = self.read_all()  # Clear the initial buffer
-        
+        # Scpy.__init__ has already set the timeout and cleared the input buffer
+
         # Optionally reset the device and set the response time to minimum (1 s)
         # self.reset()
         # self.delay_time(1)
 
+    def _bool_scpi(self, cmd, on=None):
+        """Set (if on is given) and query an ON/OFF SCPI setting.
+
+        Parameters
+        ----------
+        cmd : str
+            SCPI command, queried as cmd + '?'
+        on : str or int, optional
+            'ON', 1, True to enable; 'OFF', 0, False to disable (see _on_off)
+
+        Returns
+        -------
+        int
+            1 for ON, 0 for OFF
+        """
+        if on is not None:
+            return 1 if self.write_and_query((cmd, _on_off(on)), cmd + '?') == 'ON' else 0
+        return 1 if self.command(cmd + '?') == 'ON' else 0
+
     def apply_voltage(self, volts=None):
         """Set or get the output voltage.
 
@@ -75,8 +117,8 @@ class Ax6003Py(scpy.Scpy):
             Currently applied voltage [V]
         """
         if volts is not None:
-            self.write_line(':VOLT', volts)
-        return self.command('APPL?')[0]
+            return self.write_and_query((':VOLT', volts), 'APPL?')[0]
+        return self._query_raw(self._CMD_APPL_Q)[0]
 
     def apply_current(self, ampers=None):
         """Set or get the output current.
@@ -92,8 +134,8 @@ class Ax6003Py(scpy.Scpy):
             Currently applied current [A]
         """
         if ampers is not None:
-            self.write_line(':CURR', ampers)
-        return self.command('APPL?')[1]
+            return self.write_and_query((':CURR', ampers), 'APPL?')[1]
+        return self._query_raw(self._CMD_APPL_Q)[1]
 
     def apply(self, volts=None, ampers=None):
         """Set or get the output voltage and current.
@@ -111,8 +153,8 @@ class Ax6003Py(scpy.Scpy):
             Currently applied voltage [V] and current [A]
         """
         if volts and ampers:
-            self.write_line(':APPL', volts, ampers)
-        return self.command('APPL?')
+            return self.write_and_query((':APPL', volts, ampers), 'APPL?')
+        return self._query_raw(self._CMD_APPL_Q)
 
     def measure_voltage(self):
         """Measure and return the real-time output voltage.
@@ -122,7 +164,7 @@ class Ax6003Py(scpy.Scpy):
         float
             Measured voltage [V]
         """
-        return self.command(':MEAS:VOLT?')
+        return self._query_raw(self._CMD_MEAS_V)
 
     def measure_current(self):
         """Measure and return the real-time output current.
@@ -132,7 +174,7 @@ class Ax6003Py(scpy.Scpy):
         float
             Measured current [A]
         """
-        return self.command(':MEAS:CURR?')
+        return self._query_raw(self._CMD_MEAS_C)
 
     def measure_power(self):
         """Measure and return the real-time output power.
@@ -142,7 +184,21 @@ class Ax6003Py(scpy.Scpy):
         float
             Measured power [W]
         """
-        return self.command(':MEAS:POWer?')
+        return self._query_raw(self._CMD_MEAS_P)
+
+    def measure_all(self):
+        """Measure voltage, current and power with a single compound query.
+
+        Returns
+        -------
+        tuple (float, float, float) or None
+            Measured voltage [V], current [A] and power [W];
+            None on timeout or if the reply does not hold three values
+        """
+        response = self._query_raw(self._CMD_MEAS_ALL)
+        if isinstance(response, list) and len(response) == 3:
+            return tuple(response)
+        return None
 
     def output(self, on=None):
         """Turn the output ON or OFF.
@@ -150,17 +206,14 @@ class Ax6003Py(scpy.Scpy):
         Parameters
         ----------
         on : str or int, optional
-            'ON', 1 to enable; 'OFF', 0 to disable
+            'ON', 1, True to enable; 'OFF', 0, False to disable (any case)
 
         Returns
         -------
         int
             Output status: 1 for ON, 0 for OFF
         """
-        if on is not None:
-            on = 'ON' if on == 'ON' or on == 1 else 'OFF'
-            self.write_line(':OUTP', on)
-        return 1 if self.command(':OUTP?') == 'ON' else 0
+        return self._bool_scpi(':OUTP', on)
 
     def delay_time(self, delay_sec=None):
         """Set or get the delay time after an apply command.
@@ -176,7 +229,7 @@ class Ax6003Py(scpy.Scpy):
             Current delay time [s]
         """
         if delay_sec is not None:
-            self.write_line(':SYST:AUTO:DEL', delay_sec)
+            return self.write_and_query((':SYST:AUTO:DEL', delay_sec), ':SYST:AUTO:DEL?')
         return self.command(':SYST:AUTO:DEL?')
 
     def current_protection_level(self, ampers=None):
@@ -193,7 +246,7 @@ class Ax6003Py(scpy.Scpy):
             Applied current protection level [A]
         """
         if ampers is not None:
-            self.write_line(':CURR:PROT:LEV', ampers)
+            return self.write_and_query((':CURR:PROT:LEV', ampers), ':CURR:PROT:LEV?')
         return self.command(':CURR:PROT:LEV?')
 
     def current_protection_state(self, on=None):
@@ -202,17 +255,14 @@ class Ax6003Py(scpy.Scpy):
         Parameters
         ----------
         on : str or int, optional
-            'ON', 1 to enable; 'OFF', 0 to disable
+            'ON', 1, True to enable; 'OFF', 0, False to disable (any case)
 
         Returns
         -------
         int
             Current protection status: 1 for ON, 0 for OFF
         """
-        if on is not None:
-            on = 'ON' if on and on != 'OFF' else 'OFF'
-            self.write_line(':CURR:PROT:STAT', on)
-        return 1 if self.command(':CURR:PROT:STAT?') == 'ON' else 0
+        return self._bool_scpi(':CURR:PROT:STAT', on)
 
     def current_protection_triped(self):
         """Check if current protection has been triggered.
@@ -232,8 +282,7 @@ class Ax6003Py(scpy.Scpy):
         int
             1 if still tripped, 0 if cleared
         """
-        self.command(':CURR:PROT:CLE')
-        return 1 if self.command(':CURR:PROT:TRIP?') == 'ON' else 0
+        return 1 if self.command(':CURR:PROT:CLE', query=':CURR:PROT:TRIP?') == 'ON' else 0
 
     def voltage_protection_state(self, on=None):
         """Enable or disable voltage protection.
@@ -241,17 +290,14 @@ class Ax6003Py(scpy.Scpy):
         Parameters
         ----------
         on : str or int, optional
-            'ON', 1 to enable; 'OFF', 0 to disable
+            'ON', 1, True to enable; 'OFF', 0, False to disable (any case)
 
         Returns
         -------
         int
             Voltage protection status: 1 for ON, 0 for OFF
         """
-        if on is not None:
-            on = 'ON' if on and on != 'OFF' else 'OFF'
-            self.write_line(':VOLT:PROT:STAT', on)
-        return 1 if self.command(':VOLT:PROT:STAT?') == 'ON' else 0
+        return self._bool_scpi(':VOLT:PROT:STAT', on)
 
     def voltage_protection_level(self, volts=None):
         """Set or get the voltage protection level (fuse).
@@ -267,7 +313,7 @@ class Ax6003Py(scpy.Scpy):
             Applied voltage protection level [V]
         """
         if volts is not None:
-            self.write_line(':VOLT:PROT:LEV', volts)
+            return self.write_and_query((':VOLT:PROT:LEV', volts), ':VOLT:PROT:LEV?')
         return self.command(':VOLT:PROT:LEV?')
 
     def voltage_protection_triped(self):
@@ -288,8 +334,7 @@ class Ax6003Py(scpy.Scpy):
         int
             1 if still tripped, 0 if cleared
         """
-        self.command(':VOLT:PROT:CLE')
-        return 1 if self.command(':VOLT:PROT:TRIP?') == 'ON' else 0
+        return 1 if self.command(':VOLT:PROT:CLE', query=':VOLT:PROT:TRIP?') == 'ON' else 0
 
 
 if __name__ == '__main__':
@@ -301,5 +346,6 @@ if __name__ == '__main__':
 
     print(serial_port_dev)
 
-    ps = Ax6003Py(port=serial_port_dev, baudrate=baudrate)
-    #oc(ps.measure_voltage(),'equ')
+    with Ax6003Py(port=serial_port_dev, baudrate=baudrate) as ps:
+        print(ps.apply())
+        #oc(ps.measure_voltage(),'equ')
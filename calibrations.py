@@ -3,9 +3,14 @@
 # -*- coding: utf-8 -*-
 
 import os
-import jsonpickle
+import json
 from functools import wraps
-from typing import Callable, Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy е по избор – само за polynom_batch
+    np = None
 
 class Calibrations:
     def __init__(self):
@@ -13,6 +18,9 @@ class Calibrations:
             "equ": [1.0, 0.0],
             "hlv": [0.5, 0.0]
         }
+        self._poly_arrays: Dict[str, Tuple[List[float], Any]] = {}
+        # (копие на poly_dict, низ) – низът важи, докато копието съвпада
+        self._repr_cache: Optional[Tuple[Dict[str, Tuple[float, ...]], str]] = None
   
     def __call__(self, poly_name: str, value: float )->float:
         if poly_name is not None:
@@ -29,40 +37,57 @@ class Calibrations:
             return wrapper
         return decorator
         
-    def polynom(self,  name_of_coef: str, x: float) -> float:
+    def _coefficients(self, name_of_coef: str) -> List[float]:
         coef = self.poly_dict.get(name_of_coef)
-        if coef is None:
-            raise KeyError(f"Polynomial '{name_of_coef}' not found.")
-        if not coef:
+        if not coef:  # една проверка в нормалния случай
+            if coef is None:
+                raise KeyError(f"Polynomial '{name_of_coef}' not found.")
             raise ValueError(f"Polynomial '{name_of_coef}' has no coefficients.")
+        return coef
+
+    def polynom(self,  name_of_coef: str, x: float) -> float:
         # Метод на Хорнер
         result = 0.0
-        for c in coef:
+        for c in self._coefficients(name_of_coef):
             result = result * x + c
         return result
 
+    def polynom_batch(self, name_of_coef: str, xs: Sequence[float]) -> List[float]:
+        """Прилага полинома върху масив от стойности (с numpy, ако е наличен)."""
+        coef = self._coefficients(name_of_coef)
+        if np is None:
+            return [self.polynom(name_of_coef, x) for x in xs]
+        # Масивът се пази заедно с копие на коефициентите, за да се види промяна
+        cached = self._poly_arrays.get(name_of_coef)
+        if cached is None or cached[0] != coef:
+            cached = self._poly_arrays[name_of_coef] = (list(coef), np.asarray(coef, dtype=np.float64))
+        return np.polyval(cached[1], np.asarray(xs, dtype=np.float64)).tolist()
+
     def add_polynom(self, polynom_name: str, coef: List[float]) -> None:
         if not coef:
             raise ValueError("coef must contain at least one coefficient.")
         self.poly_dict[polynom_name] = coef
 
     def polynoms_list(self) -> str:
-        items = (f"{k}: {v}" for k, v in sorted(self.poly_dict.items()))
-        return ", ".join(items)
-
-    def __repr__(self) -> str:
-        return self.polynoms_list()
+        cache = self._repr_cache
+        poly_dict = self.poly_dict
+        if (cache is None or len(cache[0]) != len(poly_dict)
+                or not all(cache[0].get(k) == tuple(v) for k, v in poly_dict.items())):
+            snapshot = {k: tuple(v) for k, v in poly_dict.items()}
+            items = (f"{k}: {v}" for k, v in sorted(poly_dict.items()))
+            cache = self._repr_cache = (snapshot, ", ".join(items))
+        return cache[1]
 
-    def __str__(self) -> str:
-        return self.polynoms_list()
+    __repr__ = polynoms_list
+    __str__ = polynoms_list
 
     def polynoms_to_file(self, file_name: str) -> None:
         with open(file_name, 'w') as f:
-            f.write(jsonpickle.encode(self.poly_dict, indent=4))
+            f.write(json.dumps(self.poly_dict, indent=4))
 
     def polynoms_from_file(self, file_name: str) -> None:
         with open(file_name, 'r') as f:
-            self.poly_dict = jsonpickle.decode(f.read())
+            self.poly_dict = json.loads(f.read())
 
     @classmethod
     def from_file_or_default(cls, file_name: str) -> "Calibrations":
@@ -10,41 +10,47 @@
 
 import serial
 import re
+import threading
 import time
+from functools import wraps
 from tools import print_my_ip, search_by_manufacturer, serial_ports_list
 
-def prepare_line_to_send(*args):
+# Patterns used by parse_line for every received line
+_SPLIT_RE = re.compile(rb"[, ;#!?:]+")
+_CLEAN_RE = re.compile(r"[^0-9,.]")
+_INT_RE = re.compile(r"^[+-]?\d+$")
+_NUM_RE = re.compile(r"^[+-]?(\d+\.\d*|\.\d+|\d+)([eE][+-]?\d+)?$")
+
+# Returned by parse_line for an empty line (end of reply or timeout)
+_EMPTY = object()
+
+def prepare_line_to_send(*args, query=None):
     """Converts all input arguments into a formatted byte string for serial transmission.
 
     Handles int, float, and str input types. Adds newline at the end.
     Floats are scaled (x1000) and appended with a marker "-3" [legacy, not implemented here].
+    If query is given it is appended after a ';' (SCPI compound command).
 
     Returns
     -------
     bytes
         A single byte string ready for serial transmission.
     """
-    output_buffer = []
-    for index, word in enumerate(args):
-        if isinstance(word, int) or isinstance(word, float) or isinstance(word, str):
-            word = str(word).encode()
-
-        if word[-1] == 13:  # Remove trailing carriage return if present
-            word = word[:-1]
-
-        output_buffer.append(word)
-        output_buffer.append(b',' if index else b' ')
-
-    output_buffer.pop(-1)  # Remove trailing separator
-    output_buffer.append(b'\n')
-
-    return b''.join(output_buffer)
+    head, *rest = (word.decode() if isinstance(word, bytes) else str(word)
+                   for word in args)
+    head = head.rstrip('\r')  # Remove trailing carriage return if present
+    if rest:
+        head = head + ' ' + ','.join(w.rstrip('\r') for w in rest)
+    if query is not None:
+        head = head + ';' + query
+    return (head + '\n').encode()
 
 def parse_line(line):
     """Parses a byte line received from serial into appropriate Python types.
 
     Splits the line into tokens, then converts each to int or float when possible.
     Leaves token as string if conversion fails.
+    A reply to a compound query ('a;b;c') is parsed field by field into a list.
 
     Parameters
     ----------
@@ -54,24 +60,24 @@ def parse_line(line):
     Returns
     -------
     int, float, str, or list of these
-        Parsed response.
+        Parsed response, or _EMPTY if the line holds no data.
     """
-    line = line.decode().strip()
-    tokens = re.split(r"[, ;#!?:]+", line)
+    line = line.strip()
+    if not line:
+        return _EMPTY
+    if b';' in line:
+        return [parse_line(field) if field.strip() else '' for field in line.split(b';')]
+    tokens = _SPLIT_RE.split(line)
     output_val = []
     for token in tokens:
-        cleaned = re.sub('[^0-9,.]', '', token)
-        try:
+        token = token.decode()
+        cleaned = _CLEAN_RE.sub('', token)
+        if _INT_RE.match(cleaned):
             output_val.append(int(cleaned))
-            continue
-        except ValueError:
-            pass
-        try:
+        elif _NUM_RE.match(cleaned):
             output_val.append(float(cleaned))
-            continue
-        except ValueError:
-            pass
-        output_val.append(token)
+        else:
+            output_val.append(token)
 
     if len(output_val) == 1:
         return output_val[0]
@@ -80,10 +86,23 @@ def parse_line(line):
     return output_val
 
 
+def _locked(method):
+    """Run the method while holding the instance I/O lock."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._io_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class Scpy(serial.Serial):
     """Main class for SCPI communication over serial interface.
 
     Inherits from serial.Serial and provides methods for SCPI command interaction.
+
+    Calls on the same instance from several threads are serialized by a
+    per-port lock; different ports do not block each other, so several
+    instruments can be polled in parallel (e.g. concurrent.futures.ThreadPoolExecutor).
     """
 
     def __init__(self, **kargs):
@@ -96,23 +115,116 @@ class Scpy(serial.Serial):
         baudrate : int
             Serial baud rate (e.g., 9600)
         """
+        self._io_lock = threading.RLock()
         super().__init__(**kargs)
         self.string_rep = f"Connected on {kargs}\n\n"
+        self.low_latency()
+        # Time on the wire for one character: start + data + parity + stop bits
+        self._byte_time = (1 + self.bytesize + self.stopbits
+                           + (1 if self.parity != serial.PARITY_NONE else 0)) / self.baudrate
+        self._rx = bytearray()  # Bytes received after the last returned line
         self.timeout = 1
         _ = self.read_all()  # Clear buffer
 
-    def write_line(self, *args):
+    def low_latency(self):
+        """Ask the USB-serial driver to drop its 16 ms buffering timer.
+
+        Sets ASYNC_LOW_LATENCY on Linux (FTDI/Prolific adapters then use
+        latency_timer=1). Silently ignored where it is not supported.
+
+        Returns
+        -------
+        bool
+            True if the flag was set, False otherwise
+        """
+        set_low_latency_mode = getattr(self, 'set_low_latency_mode', None)
+        if set_low_latency_mode is not None:
+            try:
+                set_low_latency_mode(True)
+                return True
+            except (OSError, ValueError, NotImplementedError):
+                return False
+        # Older pyserial without set_low_latency_mode (Linux only)
+        try:
+            import array
+            import fcntl
+            import termios
+            buf = array.array('i', [0] * 32)
+            fcntl.ioctl(self.fileno(), termios.TIOCGSERIAL, buf)
+            buf[4] |= 0x2000  # ASYNC_LOW_LATENCY
+            fcntl.ioctl(self.fileno(), termios.TIOCSSERIAL, buf)
+            return True
+        except (ImportError, AttributeError, OSError):
+            return False
+
+    @_locked
+    def write_line(self, *args, query=None):
         """Formats and sends a command line to the device.
 
-        Waits for the output buffer to clear before sending.
+        Blocks (in the driver, via flush/tcdrain) until the line is transmitted.
         """
-        line = prepare_line_to_send(*args)
-        while self.out_waiting:
-            pass
-        self.echo_of_the_command = line
-        self.write(line)
+        self.write_raw(prepare_line_to_send(*args, query=query))
+
+    @_locked
+    def write_raw(self, raw_bytes):
+        """Send an already encoded command line (newline included) as is."""
+        self.echo_of_the_command = raw_bytes
+        self.write(raw_bytes)
         self.flush()
 
+    @_locked
+    def read_line(self, terminator=b'\n', expected_bytes=None, deadline=None):
+        """Read one line, fetching everything already waiting in one read().
+
+        Avoids the byte-by-byte read(1) loop of readline(), which is slow on
+        Windows where every read also queries in_waiting.
+
+        Parameters
+        ----------
+        terminator : bytes
+            End of line marker
+        expected_bytes : int, optional
+            Exact reply length (terminator included). The first read then asks
+            for all of it at once; a too large value waits for the timeout.
+        deadline : float, optional
+            time.monotonic() value to give up at. Only bytes already waiting
+            are read, so self.timeout is not used (and never reconfigured).
+
+        Returns
+        -------
+        bytes
+            Line including the terminator, or what arrived before the timeout
+        """
+        rx = self._rx
+        end = rx.find(terminator)
+        if end < 0 and expected_bytes is not None and expected_bytes > len(rx):
+            need = expected_bytes - len(rx)
+            if deadline is None:
+                rx += self.read(need)
+            else:
+                while self.in_waiting < need and time.monotonic() < deadline:
+                    time.sleep(self._byte_time)
+                rx += self.read(min(need, self.in_waiting))
+            end = rx.find(terminator)
+        while end < 0:
+            if deadline is None:
+                chunk = self.read(self.in_waiting or 1)
+            else:
+                waiting = self.in_waiting
+                while not waiting and time.monotonic() < deadline:
+                    time.sleep(self._byte_time)
+                    waiting = self.in_waiting
+                chunk = self.read(waiting) if waiting else b''
+            if not chunk:
+                break
+            rx += chunk
+            end = rx.find(terminator)
+        end = len(rx) if end < 0 else end + len(terminator)
+        line = bytes(rx[:end])
+        del rx[:end]
+        return line
+
+    @_locked
     def raw_lines(self, *args, timeout=5):
         """Send command and receive raw response lines.
 
@@ -130,12 +242,50 @@ class Scpy(serial.Serial):
         tmp_timeout = self.timeout
         self.timeout = timeout
         _ = self.read_all()
+        self._rx.clear()
         self.write_line(*args)
         lines = self.readlines()
         self.timeout = tmp_timeout
         return lines
 
-    def command(self, *args, timeout=2.5):
+    def _recv(self, timeout, expected_bytes=None, multi=False):
+        """Wait for and parse the reply to the last sent command.
+
+        timeout bounds the whole reply, not each read.
+        """
+        deadline = time.monotonic() + timeout
+
+        def next_line(expected_bytes=None):
+            return self.read_line(expected_bytes=expected_bytes, deadline=deadline)
+
+        echo = self.echo_of_the_command.rstrip()  # Device may echo with '\r\n'
+        line = next_line(expected_bytes)
+        if echo in line:
+            line = next_line(expected_bytes)
+        if multi:
+            response = []
+            while True:
+                parsed = parse_line(line)
+                if parsed is _EMPTY:
+                    break
+                response.append(parsed)
+                line = next_line()
+                if echo in line:
+                    line = next_line()
+        else:
+            response = parse_line(line)
+
+        self.echo_of_the_command = None
+        if not multi:
+            return None if response is _EMPTY else response
+        if len(response) == 1:
+            return response[0]
+        if not response:
+            return None
+        return response
+
+    @_locked
+    def command(self, *args, timeout=2.5, query=None, expected_bytes=None, multi=False):
         """Send command and return parsed response.
 
         Main method to communicate with SCPI device.
@@ -146,39 +296,49 @@ class Scpy(serial.Serial):
             Command and arguments.
         timeout : float
             Read timeout.
+        query : str, optional
+            Query appended to the same line after ';'
+        expected_bytes : int, optional
+            Known length of the reply line, read with a single read()
+        multi : bool
+            Collect reply lines until an empty line or timeout
 
         Returns
         -------
         Parsed response (int, float, str, or list)
         """
-        tmp_timeout = self.timeout
-        self.timeout = timeout
+        return self._query_raw(prepare_line_to_send(*args, query=query), timeout=timeout,
+                               expected_bytes=expected_bytes, multi=multi)
+
+    @_locked
+    def _query_raw(self, raw_bytes, timeout=2.5, expected_bytes=None, multi=False):
+        """Round-trip for an already encoded line; command() encodes and calls this.
+
+        Parameters and return value as for command().
+        """
         self.flush()
-        while self.out_waiting:
-            pass
-        time.sleep(0.25)
         _ = self.read_all()
-        self.write_line(*args)
-        response = []
-        while True:
-            if response:
-                break
-            line = self.readline()
-            if self.echo_of_the_command in line:
-                continue
-            parsed = parse_line(line)
-            response.append(parsed)
-            if '' in response:
-                response.remove('')
-                break
+        self._rx.clear()
+        self.write_raw(raw_bytes)
+        return self._recv(timeout, expected_bytes, multi)
 
-        self.echo_of_the_command = None
-        self.timeout = tmp_timeout
-        if len(response) == 1:
-            return response[0]
-        if not response:
-            return None
-        return response
+    def write_and_query(self, write_args, query, timeout=2.5):
+        """Send a setting and read it back in a single round-trip.
+
+        Parameters
+        ----------
+        write_args : tuple
+            Command and arguments to set (e.g. (':VOLT', 5))
+        query : str
+            Query sent on the same line (e.g. 'APPL?')
+        timeout : float
+            Read timeout.
+
+        Returns
+        -------
+        Parsed response of the query
+        """
+        return self.command(*write_args, timeout=timeout, query=query)
 
     def id_number(self):
         """Query device ID number.
@@ -218,8 +378,7 @@ class Scpy(serial.Serial):
         int
             Cleared status byte
         """
-        self.write_line('*CLS')
-        return self.command('*ESR?')
+        return self.command('*CLS', query='*ESR?')
 
     def power_on_clean_status(self, state=None):
         """Configure status clearing on power-up.
@@ -236,9 +395,10 @@ class Scpy(serial.Serial):
         """
         if state is not None:
             state = 1 if state != 0 else 0
-            self.write_line('*PSC', state)
+            return self.command('*PSC', state, query='*PSC?')
         return self.command('*PSC?')
 
+    @_locked
     def reset(self):
         """Perform full device reset.
 
@@ -258,7 +418,9 @@ class Scpy(serial.Serial):
         return self.string_rep
 
     def __del__(self):
-        self.close()
+        # Prefer 'with Scpy(...) as dev:' (serial.Serial); this is only a fallback
+        if getattr(self, 'is_open', False):
+            self.close()
 
 
 if __name__ == '__main__':
@@ -271,4 +433,5 @@ if __name__ == '__main__':
 
     print(serial_port_dev)
 
-    ps = Scpy(port=serial_port_dev, baudrate=baudrate)
+    with Scpy(port=serial_port_dev, baudrate=baudrate) as ps:
+        print(ps.id_number())